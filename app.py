@@ -1,4 +1,3 @@
-import json
 import os
 from typing import Any, Optional
 
@@ -13,6 +12,7 @@ from backend.api.routes.companion_name_tool.index import companion_name_tool
 from backend.api.routes.prefix_matrix.index import prefix_matrix
 from backend.api.routes.repeater_name_tool.index import repeater_name_tool
 from backend.api.routes.serial_usb_tool.index import serial_usb_tool
+from backend.api.services import json_backend
 from backend.api.services.contacts import prepare_contacts, ContactsOrder, ContactsType, ContactsStatus
 from backend.api.services.meshcore_stats import StatsService
 from backend.constants import FLASK_HOST, FLASK_PORT, FLASK_GET
@@ -83,7 +83,7 @@ def get_contacts():
     _type: Optional[ContactsType] = params.get("type", None)
 
     data = prepare_contacts(count=_limit, order=_order, status=_status, _type=_type)
-    return json.dumps(data)
+    return json_backend.dumps(data)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,67 @@
+import json
+from typing import Any, Callable
+
+from jinja2.utils import htmlsafe_json_dumps
+from markupsafe import Markup
+
+from backend.constants import JSON_BACKEND
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj)
+
+
+def _load_orjson_dumps() -> Callable[[Any], str]:
+    import orjson
+
+    def _orjson_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+    return _orjson_dumps
+
+
+def _select_dumps(backend: str) -> Callable[[Any], str]:
+    backend = backend.lower()
+    if backend == "json":
+        return _stdlib_dumps
+    if backend == "orjson":
+        return _load_orjson_dumps()  # Explicitly requested, so let a missing package fail loudly
+    if backend == "auto":
+        try:
+            return _load_orjson_dumps()
+        except ImportError:
+            return _stdlib_dumps
+    raise ValueError(f"Unknown JSON backend: {backend}")
+
+
+_dumps: Callable[[Any], str] = _select_dumps(JSON_BACKEND)
+
+
+def dumps(obj: Any) -> str:
+    """
+    Serialize an object to a JSON string using the configured backend.
+    :param obj: The object to serialize.
+    :return: The JSON string.
+    :rtype: str
+    """
+    return _dumps(obj)
+
+
+def join_array(fragments: list[str]) -> str:
+    """
+    Assemble a JSON array from already-serialized JSON fragments without re-serializing them.
+    :param fragments: The serialized JSON values to place in the array.
+    :return: The JSON array string.
+    :rtype: str
+    """
+    return "[" + ",".join(fragments) + "]"
+
+
+def htmlsafe_dumps(obj: Any) -> Markup:
+    """
+    Serialize an object with the configured backend, escaped for embedding in HTML the same way as Jinja's `tojson`.
+    :param obj: The object to serialize.
+    :return: The escaped JSON, marked safe for templates.
+    :rtype: Markup
+    """
+    return htmlsafe_json_dumps(obj, dumps=lambda value, **_: _dumps(value))
@@ -0,0 +1,164 @@
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from coloradomesh.internal.utils import epoch_to_datetime  # Probably shouldn't be accessing internal utils
+from coloradomesh.meshcore.models.general import Node
+from coloradomesh.meshcore.services.nodes import get_colorado_nodes
+from coloradomesh.meshcore.services.public_keys import reserved_public_key_ids
+
+from backend.api.services.json_backend import dumps, join_array
+from backend.constants import NODE_SNAPSHOT_TTL_SECONDS
+
+# Normalize once for consistent comparisons
+reserved_ids = {rid.upper() for rid in reserved_public_key_ids()}
+
+# Map node type to display name
+_type_display = {
+    "REPEATER": "🔁 Repeater",
+    "COMPANION": "📱 Companion",
+    "ROOM_SERVER": "🏢 Room Server",
+    "SENSOR": "📊 Sensor",
+    "UNKNOWN": "❓ Unknown"
+}
+
+# Keys of a node's display dict that feed the free-text search, in order
+_search_keys = [
+    "id",
+    "name",
+    "location",
+    "status",
+    "status_value",
+    "public_key",
+    "contact_url",
+    "last_heard",
+    "node_type",
+]
+
+
+def get_4char_id(node: Node) -> str:
+    """Get the first 4 hex chars of a node's public key ID."""
+    return node.public_key_id_4_char.upper()
+
+
+def is_reserved_id(cell_id_4: str) -> bool:
+    cell_id_4 = cell_id_4.upper()
+    return cell_id_4 in reserved_ids or cell_id_4[:2] in reserved_ids
+
+
+def build_node_info(node: Node) -> dict:
+    """
+    Build the display dict for a single node.
+    :param node: The node to describe.
+    :return: A JSON-serializable dict of display values for the node.
+    :rtype: dict
+    """
+    rid = get_4char_id(node)
+    node_type_name = node.node_type.name if node.node_type else "UNKNOWN"
+    status = node.status.to_str()
+
+    return {
+        "status": status,
+        "status_value": status.upper(),
+        "location": f"{node.latitude}, {node.longitude}" if all(
+            [node.latitude, node.longitude]) else "N/A",
+        "latitude": node.latitude,
+        "longitude": node.longitude,
+        "last_heard": epoch_to_datetime(node.last_heard),
+        "id": rid,
+        "is_reserved_id": is_reserved_id(rid),
+        "public_key": node.public_key,
+        "name": node.name,
+        "contact_url": node.contact_url,
+        "node_type": _type_display.get(node_type_name, "❓ Unknown"),
+    }
+
+
+def _build_search_text(info: dict) -> str:
+    values = [info.get(key) for key in _search_keys]
+    return " ".join(str(value) for value in values if value).lower()
+
+
+class NodeFragment:
+    """
+    Precomputed display dict, JSON string and search text for a single node.
+    """
+
+    __slots__ = ("info", "json", "search_text")
+
+    def __init__(self, node: Node):
+        self.info: dict = build_node_info(node)
+        self.json: str = dumps(self.info)
+        self.search_text: str = _build_search_text(self.info)
+
+
+class NodeSnapshot:
+    """
+    A list of nodes together with their precomputed fragments, built once and shared by every consumer.
+    """
+
+    def __init__(self, nodes: list[Node]):
+        self.nodes: list[Node] = nodes
+        # Keyed by object identity; the snapshot holds references to every node so IDs stay valid
+        self._fragments: dict[int, NodeFragment] = {id(node): NodeFragment(node) for node in nodes}
+        # Bucket nodes by ID prefix once, so the matrix looks cells up instead of rescanning every node per cell
+        self.nodes_by_prefix_2: dict[str, list[Node]] = {}
+        self.nodes_by_id: dict[str, list[Node]] = {}
+        for node in nodes:
+            rid = get_4char_id(node)
+            self.nodes_by_prefix_2.setdefault(rid[:2], []).append(node)
+            self.nodes_by_id.setdefault(rid, []).append(node)
+        self._derived: dict[str, Any] = {}
+        self._derived_lock = threading.Lock()
+
+    def derived(self, key: str, build: Callable[["NodeSnapshot"], Any]) -> Any:
+        """
+        Get a value computed from this snapshot, building it on first use and reusing it until the snapshot expires.
+        :param key: Name of the value, unique per consumer.
+        :param build: Builds the value from the snapshot.
+        :return: The cached value.
+        """
+        with self._derived_lock:  # Concurrent first requests wait for one build instead of each building
+            if key not in self._derived:
+                self._derived[key] = build(self)
+            return self._derived[key]
+
+    def fragment(self, node: Node) -> NodeFragment:
+        return self._fragments[id(node)]
+
+    def infos(self, nodes: list[Node]) -> list[dict]:
+        return [self.fragment(node).info for node in nodes]
+
+    def info_json(self, nodes: list[Node]) -> str:
+        """
+        Serialize nodes by joining their precomputed JSON fragments.
+        A single node is serialized as an object, multiple nodes as an array.
+        """
+        if len(nodes) == 1:
+            return self.fragment(nodes[0]).json
+        return join_array([self.fragment(node).json for node in nodes])
+
+    def search_text(self, nodes: list[Node]) -> str:
+        return " ".join(text for text in (self.fragment(node).search_text for node in nodes) if text)
+
+
+_current_snapshot: Optional[NodeSnapshot] = None
+_current_snapshot_built_at: float = 0.0
+_snapshot_lock = threading.Lock()
+
+
+def get_node_snapshot() -> NodeSnapshot:
+    """
+    Get the shared node snapshot, fetching the node list again only once the current snapshot is older than
+    NODE_SNAPSHOT_TTL_SECONDS.
+    :return: The shared node snapshot.
+    :rtype: NodeSnapshot
+    """
+    global _current_snapshot, _current_snapshot_built_at
+
+    with _snapshot_lock:  # Concurrent requests wait for one refresh instead of each fetching the node list
+        if _current_snapshot is None or time.monotonic() - _current_snapshot_built_at >= NODE_SNAPSHOT_TTL_SECONDS:
+            nodes: list[Node] = get_colorado_nodes()
+            _current_snapshot = NodeSnapshot(nodes=nodes)
+            _current_snapshot_built_at = time.monotonic()
+        return _current_snapshot
@@ -10,3 +10,12 @@ DEFAULT_RATE_LIMIT = "50 per day"
 
 CONSOLE_LOG_LEVEL = os.getenv("CONSOLE_LOG_LEVEL", "INFO")
 FILE_LOG_LEVEL = os.getenv("FILE_LOG_LEVEL", "DEBUG")
+
+# JSON serialization backend: "auto" prefers orjson when installed, "orjson" or "json" forces one
+JSON_BACKEND = os.getenv("JSON_BACKEND", "auto")
+
+# How long a fetched node list (and everything precomputed from it) is reused before fetching it again
+NODE_SNAPSHOT_TTL_SECONDS = int(os.getenv("NODE_SNAPSHOT_TTL_SECONDS", 300))
+
+SERIAL_COMMANDS_PROFILE_PATH = "static/data/default_serial_commands.json"
+SERIAL_COMMANDS_SCHEMA_PATH = "serial_commands.schema.json"
@@ -0,0 +1,131 @@
+"""
+Provision several MeshCore devices over serial at once.
+
+Examples:
+    python -m backend.provisioning --action information --device /dev/ttyUSB0 --device /dev/ttyUSB1
+    python -m backend.provisioning --device /dev/ttyUSB0=repeater_1.json --device /dev/ttyUSB1=repeater_2.json
+    python -m backend.provisioning --action information --simulate 12
+
+A settings file is a saved /repeater_name_tool/submit response (or just its "settings_json");
+its settings are applied after any --action profiles.
+"""
+import argparse
+import asyncio
+import sys
+
+from backend.constants import SERIAL_COMMANDS_PROFILE_PATH, SERIAL_COMMANDS_SCHEMA_PATH
+from backend.provisioning.firmware_simulator import FirmwareSimulator
+from backend.provisioning.profile import (
+    ProfileError,
+    build_settings_action,
+    get_action,
+    load_profile,
+    load_settings,
+)
+from backend.provisioning.provisioner import (
+    DEFAULT_RESPONSE_TIMEOUT,
+    DeviceJob,
+    DeviceResult,
+    ProgressEvent,
+    Provisioner,
+)
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m backend.provisioning",
+                                     description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", default=SERIAL_COMMANDS_PROFILE_PATH, help="Serial command profile JSON")
+    parser.add_argument("--schema", default=SERIAL_COMMANDS_SCHEMA_PATH, help="Schema to validate the profile against")
+    parser.add_argument("--action", action="append", default=[], dest="actions",
+                        help="Profile action ID to run on every device (repeatable)")
+    parser.add_argument("--device", action="append", default=[], dest="devices", metavar="PORT[=SETTINGS]",
+                        help="Serial port to provision, optionally with a repeater settings file (repeatable)")
+    parser.add_argument("--simulate", type=int, default=0, metavar="COUNT",
+                        help="Add COUNT simulated devices on pseudo-terminals")
+    parser.add_argument("--simulated-settings", default=None, metavar="SETTINGS",
+                        help="Repeater settings file to apply to every simulated device")
+    parser.add_argument("--allow-missing-private-key", action="store_true",
+                        help="Apply settings that set a name without a private key (prv.key)")
+    parser.add_argument("--response-timeout", type=float, default=DEFAULT_RESPONSE_TIMEOUT,
+                        help="Seconds to wait for a reply to each command")
+    parser.add_argument("--max-concurrency", type=_positive_int, default=None, help="Limit how many devices run at once")
+    return parser.parse_args(argv)
+
+
+def _print_progress(event: ProgressEvent) -> None:
+    print(f"[{event.port}] {event.step}/{event.total_steps} {event.elapsed:6.2f}s {event.message}", flush=True)
+
+
+def _print_summary(results: list[DeviceResult]) -> None:
+    print()
+    for result in results:
+        status = "OK" if result.success else f"FAILED ({result.error})"
+        slowest = max(result.steps, key=lambda step: step.elapsed if step.command else 0, default=None)
+        slowest_text = f", slowest: {slowest.command} {slowest.elapsed:.2f}s" if slowest and slowest.command else ""
+        print(f"{result.port}: {status} in {result.elapsed:.2f}s, {len(result.steps)} steps{slowest_text}")
+
+
+async def _run(args: argparse.Namespace) -> int:
+    profile = load_profile(path=args.profile, schema_path=args.schema)
+    base_actions = [get_action(profile, action_id) for action_id in args.actions]
+
+    def settings_action(settings_path: str) -> dict:
+        return build_settings_action(load_settings(settings_path),
+                                     allow_missing_private_key=args.allow_missing_private_key)
+
+    jobs: list[DeviceJob] = []
+    for device in args.devices:
+        port, _, settings_path = device.partition("=")
+        actions = list(base_actions)
+        if settings_path:
+            actions.append(settings_action(settings_path))
+        jobs.append(DeviceJob(port=port, actions=actions))
+
+    simulated_actions = list(base_actions)
+    if args.simulated_settings:
+        simulated_actions.append(settings_action(args.simulated_settings))
+
+    # Check everything before starting any simulators, so early exits have nothing to clean up
+    if not jobs and not args.simulate:
+        print("No devices given; use --device or --simulate", file=sys.stderr)
+        return 2
+    if not any(job.actions for job in jobs) and not (args.simulate and simulated_actions):
+        print("Nothing to run; use --action or give a settings file", file=sys.stderr)
+        return 2
+
+    provisioner = Provisioner(profile=profile,
+                              on_progress=_print_progress,
+                              response_timeout=args.response_timeout,
+                              max_concurrency=args.max_concurrency)
+    simulators = [FirmwareSimulator() for _ in range(args.simulate)]
+    try:
+        for simulator in simulators:
+            jobs.append(DeviceJob(port=await simulator.start(), actions=simulated_actions))
+        results = await provisioner.provision_all(jobs)
+    finally:
+        for simulator in simulators:
+            await simulator.stop()
+
+    _print_summary(results)
+    return 0 if all(result.success for result in results) else 1
+
+
+def main(argv: list[str]) -> int:
+    args = _parse_args(argv)
+    try:
+        return asyncio.run(_run(args))
+    except (ProfileError, OSError) as e:
+        print(e, file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,100 @@
+import asyncio
+import os
+import pty
+import tty
+from typing import Optional
+
+from backend.provisioning.serial_port import LineStream
+
+
+class FirmwareSimulator:
+    """
+    Imitates the MeshCore repeater serial CLI on the controlling side of a pseudo-terminal.
+    Commands are echoed back, then answered with a canned reply, so the provisioner can be exercised without hardware.
+    """
+
+    def __init__(self,
+                 reply_delay: float = 0.05,
+                 board: str = "Simulated Board",
+                 version: str = "v0.0.0-sim",
+                 disconnect_on: Optional[str] = None,
+                 silent: bool = False,
+                 reject: Optional[str] = None):
+        self.reply_delay = reply_delay  # Seconds the "device" takes to answer each command
+        self.disconnect_on = disconnect_on  # Command on which the "device" drops off the bus without replying
+        self.silent = silent  # Never answer, like a hung board or one on the wrong port or baud rate
+        self.reject = reject  # Command the "device" answers with an error
+        self.board = board
+        self.version = version
+        self.received: list[str] = []  # Every command received, in order
+        self.settings: dict[str, str] = {}
+        self.port: Optional[str] = None  # Path for the provisioner to open
+        self._stream: Optional[LineStream] = None
+        self._task: Optional[asyncio.Task] = None
+        self._follower_fd: Optional[int] = None
+
+    def _reply(self, command: str) -> Optional[str]:
+        if command == self.reject:
+            return "Error: unknown command"
+        if command == "ver":
+            return self.version
+        if command == "board":
+            return self.board
+        if command == "reboot":
+            return None  # A real device drops off the bus instead of replying
+        if command.startswith("set "):
+            key, _, value = command[4:].partition(" ")
+            self.settings[key] = value
+            return "OK"
+        if command.startswith("get "):
+            return self.settings.get(command[4:], "??")
+        return "OK"
+
+    async def _serve(self) -> None:
+        while True:
+            command = await self._stream.read_line()
+            if command is None:
+                return
+            command = command.strip()
+            self.received.append(command)
+            if command == self.disconnect_on:
+                self._stream.close()
+                os.close(self._follower_fd)  # Closing both sides makes the port report a hang-up
+                self._follower_fd = None
+                return
+            if self.silent:
+                continue
+            await self._stream.write(f"{command}\r\n".encode("utf-8"))
+            await asyncio.sleep(self.reply_delay)
+            reply = self._reply(command)
+            if reply is not None:
+                await self._stream.write(f"  -> {reply}\r\n".encode("utf-8"))
+
+    async def start(self) -> str:
+        """
+        Create the pseudo-terminal pair and start answering commands.
+        :return: The path of the follower side, to be opened like a serial device.
+        :rtype: str
+        """
+        controller_fd, self._follower_fd = pty.openpty()
+        tty.setraw(controller_fd)
+        self.port = os.ttyname(self._follower_fd)
+        self._stream = LineStream(controller_fd)
+        self._task = asyncio.create_task(self._serve())
+        return self.port
+
+    async def stop(self) -> None:
+        """Stop answering and close both sides of the pseudo-terminal. Safe to call more than once."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._stream:
+            self._stream.close()
+            self._stream = None
+        if self._follower_fd is not None:
+            os.close(self._follower_fd)
+            self._follower_fd = None
@@ -0,0 +1,159 @@
+import json
+from typing import Any, Optional
+
+import jsonschema
+from coloradomesh.meshcore.models.general import RepeaterSettings
+
+from backend.constants import SERIAL_COMMANDS_PROFILE_PATH, SERIAL_COMMANDS_SCHEMA_PATH
+
+LINE_ENDINGS = {
+    "CRLF": "\r\n",
+    "CR": "\r",
+    "LF": "\n",
+    "NONE": "",
+}
+
+
+class ProfileError(ValueError):
+    pass
+
+
+def _read_json(path: str) -> Any:
+    with open(path, "r") as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError as e:
+            raise ProfileError(f"{path} is not valid JSON: {e}") from e
+
+
+def validate_profile(profile: dict, schema_path: str = SERIAL_COMMANDS_SCHEMA_PATH) -> dict:
+    """
+    Validate a serial command profile against the serial commands JSON schema.
+    :param profile: The profile to validate.
+    :param schema_path: Path to the JSON schema.
+    :return: The same profile, if valid.
+    :rtype: dict
+    """
+    try:
+        jsonschema.validate(instance=profile, schema=_read_json(schema_path))
+    except jsonschema.ValidationError as e:
+        raise ProfileError(f"Serial command profile is invalid: {e.message}") from e
+    return profile
+
+
+def load_profile(path: str = SERIAL_COMMANDS_PROFILE_PATH, schema_path: str = SERIAL_COMMANDS_SCHEMA_PATH) -> dict:
+    """
+    Load and validate a serial command profile from a JSON file.
+    """
+    return validate_profile(_read_json(path), schema_path=schema_path)
+
+
+def get_action(profile: dict, action_id: str) -> dict:
+    for action in profile["actions"]:
+        if action["id"] == action_id:
+            return action
+    raise ProfileError(f"Action '{action_id}' is not defined in profile '{profile['name']}'")
+
+
+def action_steps(action: dict) -> list[dict]:
+    """
+    Get an action's steps in execution order, the same way the serial USB tool page does.
+    Steps are sorted by "order", keeping their original position for ties.
+    A single-command action is treated as one send step.
+    """
+    steps = action.get("steps")
+    if not steps and action.get("command", "").strip():
+        steps = [{
+            "type": "send",
+            "command": action["command"],
+            "lineEnding": action.get("lineEnding"),
+            "delayMs": action.get("delayMs"),
+        }]
+    return sorted(steps or [], key=lambda step: step.get("order", float("inf")))
+
+
+def step_payload(step: dict, action: dict, profile: dict) -> str:
+    return (step.get("command", "")
+            .replace("{profileName}", profile.get("name", ""))
+            .replace("{commandLabel}", action.get("label", ""))
+            .replace("{commandId}", action.get("id", "")))
+
+
+def parse_settings(settings: dict) -> RepeaterSettings:
+    """
+    Validate repeater settings with the coloradomesh settings model.
+    :param settings: Repeater settings, as in the "settings_json" of a /repeater_name_tool/submit response.
+    :return: The validated settings.
+    :rtype: RepeaterSettings
+    """
+    try:
+        return RepeaterSettings.model_validate(settings)
+    except (ValueError, TypeError) as e:  # The model's own validator raises TypeError on missing delays
+        raise ProfileError(f"Repeater settings are invalid: {e}") from e
+
+
+def build_settings_action(settings: RepeaterSettings, allow_missing_private_key: bool = False) -> dict:
+    """
+    Build an "apply settings" action from repeater settings, in the same order as the serial USB tool page.
+    Settings that are not present are skipped.
+    :param settings: The validated repeater settings.
+    :param allow_missing_private_key: Allow setting a name without a private key. Names embed the public key ID,
+    so by default a name without its matching private key is refused.
+    :return: A profile action applying the settings.
+    :rtype: dict
+    """
+    if settings.name and not settings.private_key and not allow_missing_private_key:
+        raise ProfileError(f"Settings for '{settings.name}' set a name but no private key (prv.key); "
+                           "add the private key the name's public key ID was generated from")
+
+    region_commands = settings.add_region_commands or []
+    commands: list[tuple[Optional[str], int]] = [
+        ("erase", 1000),
+        (settings.set_radio_command, 150),
+        (settings.set_private_key_command, 150),
+        (settings.set_name_command, 150),
+        *((command, 0) for command in region_commands[:-1]),
+        *((command, 1000) for command in region_commands[-1:]),
+        (settings.add_home_region_command, 150),
+        (settings.save_regions_command, 150),
+        (settings.set_txdelay_command, 150),
+        (settings.set_direct_txdelay_command, 150),
+        (settings.set_rxdelay_command, 150),
+        (settings.set_advert_interval_command, 150),
+        (settings.set_flood_advert_interval_command, 150),
+        (settings.set_path_hash_size_command, 150),
+        (settings.set_guest_password_command, 150),
+        (settings.set_owner_info_command, 150),
+        (settings.set_admin_password_command, 150),
+        ("reboot", 0),
+    ]
+
+    steps = []
+    for command, delay_ms in commands:
+        if command is None:
+            continue
+        steps.append({"type": "send", "command": command, "order": len(steps) + 1})
+        if delay_ms:
+            steps.append({"type": "wait", "delayMs": delay_ms, "order": len(steps) + 1})
+
+    command_count = sum(1 for step in steps if step["type"] == "send")
+    return {
+        "id": "apply_repeater_settings",
+        "label": "Apply Repeater Settings",
+        "description": f"Send {command_count} generated commands from repeater settings.",
+        "steps": steps,
+    }
+
+
+def load_settings(path: str) -> RepeaterSettings:
+    """
+    Load and validate repeater settings from a file holding either a /repeater_name_tool/submit response
+    or bare settings.
+    """
+    data = _read_json(path)
+    if not isinstance(data, dict):
+        raise ProfileError(f"{path} does not contain a JSON object")
+    settings = data.get("settings_json", data)
+    if not isinstance(settings, dict):
+        raise ProfileError(f"{path} has a settings_json that is not a JSON object")
+    return parse_settings(settings)
@@ -0,0 +1,176 @@
+import asyncio
+import time
+from typing import Callable, Optional
+
+from pydantic import BaseModel, Field
+
+from backend.provisioning.profile import LINE_ENDINGS, action_steps, step_payload
+from backend.provisioning.serial_port import LineStream, open_serial_port
+
+DEFAULT_RESPONSE_TIMEOUT = 2.0  # Seconds to wait for the first reply line after sending a command
+DEFAULT_QUIET_PERIOD = 0.1  # Seconds without new lines after which a reply is considered complete
+
+# Commands the firmware may not answer, because the device restarts or wipes itself instead of replying
+NO_REPLY_COMMANDS = {"reboot", "erase"}
+# Reply prefixes (lowercase, after the "->" marker) the firmware uses to reject a command
+ERROR_REPLY_PREFIXES = ("error", "err:", "unknown command")
+
+
+class DeviceJob(BaseModel):
+    port: str  # Serial device path, e.g. /dev/ttyUSB0
+    actions: list[dict]  # Profile actions to run on the device, in order
+
+
+class StepResult(BaseModel):
+    action_id: str
+    command: Optional[str] = None  # None for wait steps
+    response: list[str] = Field(default_factory=list)
+    timed_out: bool = False  # True if the device sent nothing back (expected for e.g. "reboot")
+    elapsed: float = 0.0
+
+    @property
+    def failure(self) -> Optional[str]:
+        """Why this step means the device was not provisioned, or None if it went fine."""
+        if self.command is None:
+            return None
+        if self.timed_out and self.command.strip() not in NO_REPLY_COMMANDS:
+            return f"No reply to '{self.command}'"
+        for line in self.response:
+            reply = line.strip().removeprefix("->").strip().lower()
+            if reply.startswith(ERROR_REPLY_PREFIXES):
+                return f"'{self.command}' was rejected: {line.strip()}"
+        return None
+
+
+class ProgressEvent(BaseModel):
+    port: str
+    step: int  # 1-based index of the step that just finished, 0 before the first step
+    total_steps: int
+    message: str
+    elapsed: float  # Seconds since this device started
+
+
+class DeviceResult(BaseModel):
+    port: str
+    success: bool = False
+    error: Optional[str] = None
+    steps: list[StepResult] = Field(default_factory=list)
+    elapsed: float = 0.0
+
+
+ProgressCallback = Callable[[ProgressEvent], None]
+
+
+async def _collect_response(stream: LineStream, sent: str, response_timeout: float, quiet_period: float) -> list[str]:
+    """
+    Collect the lines a device sends back for a command, skipping its echo of the command.
+    Waits up to `response_timeout` for the first line, then until the device has been quiet for `quiet_period`.
+    """
+    response = []
+    timeout = response_timeout
+    while True:
+        try:
+            line = await stream.read_line(timeout=timeout)
+        except asyncio.TimeoutError:
+            return response
+        if line is None:
+            raise ConnectionError("Device disconnected")
+        if not response and line.strip() == sent.strip():
+            continue
+        response.append(line)
+        timeout = quiet_period
+
+
+class Provisioner:
+    """
+    Runs serial command profile actions on many devices at once.
+    Each device gets its own task, so one device waiting on a reply never holds up the others.
+    """
+
+    def __init__(self,
+                 profile: dict,
+                 on_progress: Optional[ProgressCallback] = None,
+                 response_timeout: float = DEFAULT_RESPONSE_TIMEOUT,
+                 quiet_period: float = DEFAULT_QUIET_PERIOD,
+                 max_concurrency: Optional[int] = None):
+        self.profile = profile
+        self.on_progress = on_progress
+        self.response_timeout = response_timeout
+        self.quiet_period = quiet_period
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency is not None else None
+
+    def _report(self, port: str, step: int, total_steps: int, message: str, started: float) -> None:
+        if self.on_progress:
+            self.on_progress(ProgressEvent(port=port, step=step, total_steps=total_steps, message=message,
+                                           elapsed=time.monotonic() - started))
+
+    async def _run_step(self, stream: LineStream, action: dict, step: dict) -> StepResult:
+        started = time.monotonic()
+        step_type = step.get("type", "send").lower()
+
+        if step_type == "wait":
+            await asyncio.sleep(step.get("delayMs", action.get("delayMs", 0)) / 1000)
+            return StepResult(action_id=action["id"], elapsed=time.monotonic() - started)
+
+        if step_type not in ("send", "command"):
+            raise ValueError(f"Unsupported step type: {step_type}")
+
+        command = step_payload(step, action, self.profile)
+        line_ending = step.get("lineEnding") or action.get("lineEnding") or self.profile["serial"]["defaultLineEnding"]
+        stream.drain_lines()  # Discard unsolicited output so it isn't mistaken for this command's reply
+        await stream.write((command + LINE_ENDINGS[line_ending]).encode("utf-8"))
+        response = await _collect_response(stream, command, self.response_timeout, self.quiet_period)
+        if step.get("delayMs"):
+            await asyncio.sleep(step["delayMs"] / 1000)
+
+        return StepResult(action_id=action["id"], command=command, response=response, timed_out=not response,
+                          elapsed=time.monotonic() - started)
+
+    async def provision(self, job: DeviceJob) -> DeviceResult:
+        """
+        Run a job's actions on its device. Errors are recorded on the result rather than raised.
+        """
+        if self._semaphore:
+            async with self._semaphore:
+                return await self._provision(job)
+        return await self._provision(job)
+
+    async def _provision(self, job: DeviceJob) -> DeviceResult:
+        started = time.monotonic()
+        result = DeviceResult(port=job.port)
+        steps = [(action, step) for action in job.actions for step in action_steps(action)]
+        stream: Optional[LineStream] = None
+        try:
+            stream = await open_serial_port(job.port, self.profile["serial"])
+            self._report(job.port, 0, len(steps), "Connected", started)
+            for index, (action, step) in enumerate(steps, start=1):
+                step_result = await self._run_step(stream, action, step)
+                result.steps.append(step_result)
+                if step_result.command is None:
+                    message = f"Waited {step_result.elapsed:.2f}s"
+                else:
+                    reply = " | ".join(step_result.response) if step_result.response else "no reply"
+                    message = f">> {step_result.command} ({reply})"
+                self._report(job.port, index, len(steps), message, started)
+                if step_result.failure:
+                    raise RuntimeError(step_result.failure)  # Don't keep configuring a device that isn't listening
+            result.success = True
+        except Exception as e:
+            result.error = str(e) or e.__class__.__name__
+            self._report(job.port, len(result.steps), len(steps), f"Failed: {result.error}", started)
+        finally:
+            if stream:
+                stream.close()
+            result.elapsed = time.monotonic() - started
+        return result
+
+    async def provision_all(self, jobs: list[DeviceJob]) -> list[DeviceResult]:
+        """
+        Provision every device concurrently.
+        :param jobs: One job per serial port.
+        :return: One result per job, in the same order.
+        :rtype: list[DeviceResult]
+        """
+        return list(await asyncio.gather(*(self.provision(job) for job in jobs)))
@@ -0,0 +1,130 @@
+import asyncio
+import errno
+import os
+import termios
+from typing import Optional
+
+_PARITY_FLAGS = {
+    "none": 0,
+    "even": termios.PARENB,
+    "odd": termios.PARENB | termios.PARODD,
+}
+
+# Pseudo-terminals report an I/O error instead of EOF once the other end closes
+_CLOSED_ERRNOS = {errno.EIO, errno.EBADF}
+
+
+def _baud_constant(baud_rate: int) -> int:
+    constant = getattr(termios, f"B{baud_rate}", None)
+    if constant is None:
+        raise ValueError(f"Unsupported baud rate: {baud_rate}")
+    return constant
+
+
+def configure_raw(fd: int, serial_config: dict) -> None:
+    """
+    Put a terminal file descriptor into raw mode with the line settings from a profile's "serial" section.
+    """
+    iflag, oflag, cflag, lflag, ispeed, ospeed, cc = termios.tcgetattr(fd)
+    iflag &= ~(termios.IGNBRK | termios.BRKINT | termios.PARMRK | termios.ISTRIP
+               | termios.INLCR | termios.IGNCR | termios.ICRNL | termios.IXON)
+    oflag &= ~termios.OPOST
+    lflag &= ~(termios.ECHO | termios.ECHONL | termios.ICANON | termios.ISIG | termios.IEXTEN)
+    cflag &= ~(termios.CSIZE | termios.CSTOPB | termios.PARENB | termios.PARODD | termios.CRTSCTS)
+    cflag |= termios.CREAD | termios.CLOCAL
+    cflag |= termios.CS7 if serial_config.get("dataBits", 8) == 7 else termios.CS8
+    if serial_config.get("stopBits", 1) == 2:
+        cflag |= termios.CSTOPB
+    cflag |= _PARITY_FLAGS[serial_config.get("parity", "none")]
+    if serial_config.get("flowControl", "none") == "hardware":
+        cflag |= termios.CRTSCTS
+    speed = _baud_constant(serial_config.get("baudRate", 115200))
+    cc[termios.VMIN] = 0
+    cc[termios.VTIME] = 0
+    termios.tcsetattr(fd, termios.TCSANOW, [iflag, oflag, cflag, lflag, speed, speed, cc])
+
+
+class LineStream:
+    """
+    Line-oriented, non-blocking reader and writer over a file descriptor, driven by the asyncio event loop.
+    Incoming bytes are split on CR/LF and queued as decoded lines; blank lines are dropped.
+    """
+
+    def __init__(self, fd: int):
+        self.fd = fd
+        self._loop = asyncio.get_running_loop()
+        self._lines: asyncio.Queue[Optional[str]] = asyncio.Queue()
+        self._buffer = b""
+        self._closed = False
+        os.set_blocking(fd, False)
+        self._loop.add_reader(fd, self._on_readable)
+
+    def _on_readable(self) -> None:
+        try:
+            data = os.read(self.fd, 4096)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            if e.errno not in _CLOSED_ERRNOS:
+                raise
+            data = b""
+        if not data:
+            self._loop.remove_reader(self.fd)
+            self._lines.put_nowait(None)
+            return
+        self._buffer += data.replace(b"\r", b"\n")
+        *lines, self._buffer = self._buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                self._lines.put_nowait(line.decode("utf-8", errors="replace"))
+
+    async def read_line(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Wait for the next line. Returns None once the other end has closed.
+        Raises asyncio.TimeoutError if no line arrives within the timeout.
+        """
+        return await asyncio.wait_for(self._lines.get(), timeout=timeout)
+
+    def drain_lines(self) -> list[str]:
+        """Take every line received so far without waiting."""
+        lines = []
+        while not self._lines.empty():
+            line = self._lines.get_nowait()
+            if line is None:
+                self._lines.put_nowait(None)  # Keep the closed marker for the next reader
+                break
+            lines.append(line)
+        return lines
+
+    async def write(self, data: bytes) -> None:
+        while data:
+            try:
+                written = os.write(self.fd, data)
+            except BlockingIOError:
+                await asyncio.sleep(0.01)  # Output buffer is full, let the device catch up
+                continue
+            data = data[written:]
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._loop.remove_reader(self.fd)
+        os.close(self.fd)
+
+
+async def open_serial_port(path: str, serial_config: dict) -> LineStream:
+    """
+    Open a serial device (or the follower side of a pseudo-terminal) with a profile's line settings.
+    :param path: Path to the device, e.g. /dev/ttyUSB0.
+    :param serial_config: The "serial" section of a serial command profile.
+    :return: A line stream over the opened port.
+    :rtype: LineStream
+    """
+    fd = os.open(path, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+    try:
+        configure_raw(fd, serial_config)
+    except Exception:
+        os.close(fd)
+        raise
+    return LineStream(fd)
@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from backend.provisioning.firmware_simulator import FirmwareSimulator
+from backend.provisioning.profile import (
+    ProfileError,
+    build_settings_action,
+    get_action,
+    load_profile,
+    parse_settings,
+)
+from backend.provisioning.provisioner import DeviceJob, DeviceResult, Provisioner
+
+SETTINGS = {
+    "radio": "910.525,62.5,7,5",
+    "txdelay": 1.2,
+    "direct.txdelay": 0.8,
+    "rxdelay": 3,
+    "advert.interval": 240,
+    "flood.advert.interval": 12,
+    "prefix_size": 2,
+    "guest.password": "",
+    "password": "admin",
+    "name": "DEN-LKWD-AB12",
+    "prv.key": "ab" * 64,
+    "regions": {"all": ["den", "cos"], "home": "den"},
+}
+
+
+def _sent_commands(action: dict) -> list[str]:
+    return [step["command"] for step in action["steps"] if step["type"] == "send"]
+
+
+def _provision(simulators: list[FirmwareSimulator], actions: list[dict]) -> list[DeviceResult]:
+    async def run() -> list[DeviceResult]:
+        provisioner = Provisioner(profile=load_profile(), response_timeout=0.3, quiet_period=0.05)
+        try:
+            jobs = [DeviceJob(port=await simulator.start(), actions=actions) for simulator in simulators]
+            return await provisioner.provision_all(jobs)
+        finally:
+            for simulator in simulators:
+                await simulator.stop()
+
+    return asyncio.run(run())
+
+
+def test_default_profile_matches_schema():
+    profile = load_profile()
+    assert get_action(profile, "information")["label"] == "Information"
+
+
+def test_commands_sent_in_order_to_every_device():
+    settings_action = build_settings_action(parse_settings(SETTINGS))
+    simulators = [FirmwareSimulator(reply_delay=0.01) for _ in range(3)]
+
+    results = _provision(simulators, [settings_action])
+
+    expected = _sent_commands(settings_action)
+    assert expected[:4] == ["erase", "set radio 910.525,62.5,7,5", f"set prv.key {'ab' * 64}", "set name DEN-LKWD-AB12"]
+    assert expected[-1] == "reboot"
+    for simulator, result in zip(simulators, results):
+        assert result.success, result.error
+        assert simulator.received == [command.strip() for command in expected]  # The CLI trims trailing spaces
+        assert [step.command for step in result.steps if step.command] == expected
+
+
+def test_echo_is_skipped_and_reboot_times_out():
+    simulator = FirmwareSimulator(reply_delay=0.01, version="v1.2.3")
+    action = {"id": "test", "steps": [
+        {"type": "send", "command": "ver", "order": 1},
+        {"type": "send", "command": "reboot", "order": 2},
+    ]}
+
+    result, = _provision([simulator], [action])
+
+    ver, reboot = result.steps
+    assert ver.response == ["  -> v1.2.3"]
+    assert not ver.timed_out
+    assert reboot.response == []
+    assert reboot.timed_out
+    assert result.success
+
+
+def test_disconnect_fails_only_that_device():
+    dropped = FirmwareSimulator(reply_delay=0.01, disconnect_on="board")
+    healthy = FirmwareSimulator(reply_delay=0.01)
+    action = get_action(load_profile(), "information")
+
+    dropped_result, healthy_result = _provision([dropped, healthy], [action])
+
+    assert not dropped_result.success
+    assert dropped_result.error == "Device disconnected"
+    assert [step.command for step in dropped_result.steps if step.command] == ["ver"]
+    assert healthy_result.success
+    assert healthy.received == ["ver", "board", "clock"]
+
+
+def test_name_without_private_key_is_refused():
+    settings = parse_settings({key: value for key, value in SETTINGS.items() if key != "prv.key"})
+
+    with pytest.raises(ProfileError):
+        build_settings_action(settings)
+    assert "set name DEN-LKWD-AB12" in _sent_commands(build_settings_action(settings, allow_missing_private_key=True))
+
+
+def test_invalid_settings_raise_profile_error():
+    with pytest.raises(ProfileError):
+        parse_settings({**SETTINGS, "regions": {"all": ["den"], "home": "cos"}})
+    with pytest.raises(ProfileError):
+        parse_settings({**SETTINGS, "txdelay": "abc"})
+
+
+def test_device_that_never_replies_fails():
+    silent = FirmwareSimulator(silent=True)
+    action = get_action(load_profile(), "information")
+
+    result, = _provision([silent], [action])
+
+    assert not result.success
+    assert result.error == "No reply to 'ver'"
+    assert [step.command for step in result.steps] == ["ver"]  # Stops instead of sending the rest
+
+
+def test_rejected_command_fails():
+    simulator = FirmwareSimulator(reply_delay=0.01, reject="board")
+    action = get_action(load_profile(), "information")
+
+    result, = _provision([simulator], [action])
+
+    assert not result.success
+    assert result.error == "'board' was rejected: -> Error: unknown command"
+    assert simulator.received == ["ver", "board"]
+
+
+def test_simulator_stop_is_idempotent():
+    async def run():
+        simulator = FirmwareSimulator()
+        await simulator.start()
+        await simulator.stop()
+        await simulator.stop()  # Must not close file descriptors that now belong to something else
+
+    asyncio.run(run())